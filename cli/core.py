@@ -2,20 +2,32 @@
 import os
 import sys
 import base64
+import asyncio
+import binascii
 import json
 import sqlite3
 import shutil
 import time
+import atexit
+import threading
+from contextlib import closing
 import subprocess
-import psutil
-from datetime import datetime
-import httpx
+import functools
+import importlib.util
+from typing import TYPE_CHECKING
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cli.proto_utils import create_unified_oauth_token, create_string_field, encode_varint, create_timestamp_field
+from cli.proto_utils import create_unified_oauth_token
 try:
     import winreg
 except ImportError:
     winreg = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+if TYPE_CHECKING:
+    # Annotation only; httpx itself is imported lazily in get_http_client()
+    import httpx
 
 # API Constants from GoogleAPIService.ts
 CLIENT_ID = '1071006060591-tmhssin2h21lcre235vtolojh4g403ep.apps.googleusercontent.com'
@@ -25,6 +37,18 @@ URL_TOKEN = 'https://oauth2.googleapis.com/token'
 URL_QUOTA = 'https://cloudcode-pa.googleapis.com/v1internal:fetchAvailableModels'
 URL_LOAD_PROJECT = 'https://cloudcode-pa.googleapis.com/v1internal:loadCodeAssist'
 
+def json_loads(data):
+    """Parse JSON from str/bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None)
+
 # Config
 DB_NAME = 'cloud_accounts.db'
 # Try to find user data path
@@ -35,16 +59,61 @@ if sys.platform == 'win32':
 else:
     # Fallback for non-windows (though user is on windows)
     USER_DATA_DIR = os.path.expanduser('~/.config/AntigravityManager')
+def _iter_windows_process_images():
+    """Yield image paths of running processes via EnumProcesses + QueryFullProcessImageNameW."""
+    import ctypes
+    from ctypes import wintypes
+    
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    psapi = ctypes.WinDLL('psapi')
+    kernel32 = ctypes.WinDLL('kernel32')
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.QueryFullProcessImageNameW.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    
+    # Grow the PID buffer until EnumProcesses no longer fills it completely
+    count = 1024
+    while True:
+        pids = (wintypes.DWORD * count)()
+        needed = wintypes.DWORD()
+        if not psapi.EnumProcesses(pids, ctypes.sizeof(pids), ctypes.byref(needed)):
+            return
+        if needed.value < ctypes.sizeof(pids):
+            break
+        count *= 2
+    
+    buf = ctypes.create_unicode_buffer(260)  # MAX_PATH
+    for pid in pids[:needed.value // ctypes.sizeof(wintypes.DWORD)]:
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            continue
+        try:
+            size = wintypes.DWORD(len(buf))
+            if kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+                yield buf.value
+        finally:
+            kernel32.CloseHandle(handle)
+
+def _iter_process_images():
+    if sys.platform == 'win32':
+        yield from _iter_windows_process_images()
+        return
+    import psutil
+    for proc in psutil.process_iter(['exe']):
+        if proc.info['exe']:
+            yield proc.info['exe']
+
 def find_antigravity_executable():
     """Smartly find the Antigravity IDE executable path."""
     # 1. Try to find if it's already running (most reliable)
-    for proc in psutil.process_iter(['name', 'exe']):
-        try:
-            if proc.info['name'] and 'antigravity' in proc.info['name'].lower() and not 'manager' in proc.info['name'].lower():
-                if proc.info['exe'] and os.path.exists(proc.info['exe']):
-                    return proc.info['exe']
-        except:
-            pass
+    try:
+        for exe in _iter_process_images():
+            name = os.path.basename(exe).lower()
+            if 'antigravity' in name and not 'manager' in name and os.path.exists(exe):
+                return exe
+    except Exception:
+        pass
 
     # 2. Standard installation paths
     local_appdata = os.getenv('LOCALAPPDATA', '')
@@ -66,8 +135,29 @@ def find_antigravity_executable():
             
     return None
 
-# Global path determined at runtime
-ANTIGRAVITY_EXE_PATH = find_antigravity_executable()
+# Last discovered executable, so later runs can skip the process scan
+EXE_CACHE_PATH = os.path.join(USER_DATA_DIR, 'exe_cache.txt')
+
+@functools.lru_cache(maxsize=1)
+def get_antigravity_exe_path():
+    """Resolve the IDE executable on first use, preferring the path cached by a previous run."""
+    try:
+        with open(EXE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = f.read().strip()
+        if cached and os.path.exists(cached):
+            return cached
+    except OSError:
+        pass
+    
+    path = find_antigravity_executable()
+    if path:
+        try:
+            os.makedirs(USER_DATA_DIR, exist_ok=True)
+            with open(EXE_CACHE_PATH, 'w', encoding='utf-8') as f:
+                f.write(path)
+        except OSError:
+            pass
+    return path
 
 CLOUD_DB_PATH = os.path.join(USER_DATA_DIR, DB_NAME)
 
@@ -89,17 +179,19 @@ def decrypt_safe_storage(encrypted_data):
         print(f"Decryption error: {e}")
         return None
 
+@functools.lru_cache(maxsize=1)
 def get_data_dirs():
     home = os.path.expanduser('~')
     appdata = os.getenv('APPDATA')
-    return [
+    return (
         os.path.join(home, '.antigravity-agent'),
         os.path.join(appdata, 'Antigravity Manager'),
         os.path.join(appdata, 'AntigravityManager'),
         os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.config')),
         os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
-    ]
+    )
 
+@functools.lru_cache(maxsize=1)
 def find_db_path():
     for d in get_data_dirs():
         p = os.path.join(d, DB_NAME)
@@ -107,7 +199,39 @@ def find_db_path():
             return p
     return None
 
+# Shared connection to the accounts database, opened lazily by _get_conn()
+_CONN = None
+
+# Held around every use of the shared connection: writes also run in worker
+# threads (asyncio.to_thread), and sqlite3 builds are not all serialized
+_DB_LOCK = threading.RLock()
+
+def _get_conn():
+    """Return the process-wide accounts DB connection, or None if the DB can't be found.
+
+    Callers must hold _DB_LOCK while using the connection.
+    """
+    global _CONN
+    with _DB_LOCK:
+        if _CONN is None:
+            db_path = find_db_path()
+            if not db_path:
+                return None
+            # Autocommit mode; multi-statement writes open their own transaction with BEGIN
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            # Same journal mode the Manager GUI uses for this file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            _CONN = conn
+            atexit.register(conn.close)
+        return _CONN
+
+@functools.lru_cache(maxsize=1)
 def get_master_key():
+    # Cached for the lifetime of the process: Local State + DPAPI + .mk decryption
+    # is the slowest part of startup and the CLI never rewrites those files.
     data_dirs = get_data_dirs()
     
     # 1. We need the OSCrypt key from "Local State"
@@ -117,7 +241,7 @@ def get_master_key():
         if os.path.exists(ls_path):
             try:
                 with open(ls_path, 'r', encoding='utf-8') as f:
-                    ls_data = json.load(f)
+                    ls_data = json_loads(f.read())
                 b64_key = ls_data['os_crypt']['encrypted_key']
                 encrypted_key = base64.b64decode(b64_key)
                 # Remove "DPAPI" fixed prefix (5 bytes)
@@ -165,45 +289,83 @@ def get_master_key():
     print("[ERROR] No valid Master Key found (OSCrypt/DPAPI failed).")
     return None
 
-def decrypt_db_value(value, master_key):
+@functools.lru_cache(maxsize=4)
+def get_cipher(master_key: bytes) -> AESGCM:
+    """Return a shared AESGCM instance for the given key."""
+    return AESGCM(master_key)
+
+GCM_TAG_SIZE = 16
+# 96-bit nonce, the size AES-GCM is specified for (the GUI writes 16 bytes; both decrypt fine)
+GCM_NONCE_SIZE = 12
+
+def _pack(iv: bytes, sealed: bytes) -> str:
+    """Serialize AESGCM output (ciphertext + tag) into the GUI's iv:tag:ciphertext hex format."""
+    hexlify = binascii.hexlify
+    sealed = memoryview(sealed)
+    packed = b'%s:%s:%s' % (hexlify(iv), hexlify(sealed[-GCM_TAG_SIZE:]), hexlify(sealed[:-GCM_TAG_SIZE]))
+    return packed.decode('ascii')
+
+def _unpack(value: str):
+    """Split an iv:tag:ciphertext string into (nonce, ciphertext + tag), or None if the shape is wrong.
+
+    The tag is decoded straight after the ciphertext so the result can be handed to
+    AESGCM.decrypt without an extra concatenation.
+    """
+    i = value.find(':')
+    j = value.find(':', i + 1) if i != -1 else -1
+    if j == -1 or value.find(':', j + 1) != -1:
+        return None
+    return binascii.a2b_hex(value[:i]), binascii.a2b_hex(value[j + 1:] + value[i + 1:j])
+
+def decrypt_db_value(value, aesgcm: AESGCM):
     if not value or not isinstance(value, str):
         return value
     if value.startswith('{') or value.startswith('['):
         return value # Already plain
         
-    parts = value.split(':')
-    if len(parts) != 3:
-        # print(f"[DEBUG] Encrypted value has unexpected format: {value[:20]}...")
-        return value
-        
-    iv_hex, tag_hex, cipher_hex = parts
     try:
-        iv = bytes.fromhex(iv_hex)
-        tag = bytes.fromhex(tag_hex)
-        ciphertext = bytes.fromhex(cipher_hex)
+        unpacked = _unpack(value)
+        if unpacked is None:
+            # print(f"[DEBUG] Encrypted value has unexpected format: {value[:20]}...")
+            return value
         
-        aesgcm = AESGCM(master_key)
-        # Python's AESGCM.decrypt takes nonce and data (ciphertext + tag).
-        return aesgcm.decrypt(iv, ciphertext + tag, None).decode('utf-8')
+        iv, sealed = unpacked
+        return aesgcm.decrypt(iv, sealed, None).decode('utf-8')
     except Exception as e:
         # print(f"[DEBUG] AES Decrypt fail: {e}")
         return None
 
-def encrypt_db_value(text: str, master_key: bytes) -> str:
-    import secrets
-    iv = secrets.token_bytes(16)
+def encrypt_db_value(text: str, aesgcm: AESGCM) -> str:
+    iv = os.urandom(GCM_NONCE_SIZE)
     
-    aesgcm = AESGCM(master_key)
     # Python cryptography AESGCM.encrypt returns ciphertext + tag
     combined = aesgcm.encrypt(iv, text.encode('utf-8'), None)
     
     # Node.js format: iv_hex:auth_tag_hex:ciphertext_hex
-    tag = combined[-16:]
-    ciphertext = combined[:-16]
-    
-    return f"{iv.hex()}:{tag.hex()}:{ciphertext.hex()}"
+    return _pack(iv, combined)
+
+# PRAGMA data_version seen when the cached account list was loaded
+_ACCOUNTS_DATA_VERSION = None
 
 def get_accounts():
+    # Memoized per process (_load_accounts). Row inserts/deletes call get_accounts.cache_clear();
+    # token/quota refreshes update the cached dicts in place (_update_cached_account).
+    # Commits from other connections (e.g. the GUI) bump data_version and force a reload,
+    # so long-running commands like watch see them.
+    global _ACCOUNTS_DATA_VERSION
+    try:
+        with _DB_LOCK:
+            conn = _get_conn()
+            version = conn.execute("PRAGMA data_version").fetchone()[0] if conn else None
+    except sqlite3.Error:
+        version = None
+    if version != _ACCOUNTS_DATA_VERSION:
+        _ACCOUNTS_DATA_VERSION = version
+        _load_accounts.cache_clear()
+    return _load_accounts()
+
+@functools.lru_cache(maxsize=1)
+def _load_accounts():
     db_path = find_db_path()
     if not db_path:
         print(f"[ERROR] Could not find {DB_NAME}. Searched standard locations.")
@@ -213,33 +375,91 @@ def get_accounts():
 
     # print(f"[DEBUG] Using DB: {db_path}") # Uncomment if needed
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn()
     except sqlite3.OperationalError as e:
         print(f"[ERROR] Failed to open DB at {db_path}: {e}")
         return []
 
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM accounts ORDER BY last_used DESC")
-    rows = cursor.fetchall()
-    
     master_key = get_master_key()
+    aesgcm = get_cipher(master_key) if master_key else None
+    
+    # Only the columns the CLI uses; rows are fetched under the lock, decrypted outside it
+    with _DB_LOCK:
+        rows = conn.execute(
+            "SELECT email, name, avatar_url, last_used, is_active, token_json, quota_json "
+            "FROM accounts ORDER BY last_used DESC"
+        ).fetchall()
     accounts = []
-    for row in rows:
-        acc = dict(row)
-        if master_key:
-            token_json = decrypt_db_value(acc['token_json'], master_key)
+    for email, name, avatar_url, last_used, is_active, token_json, quota_json in rows:
+        acc = {
+            'email': email,
+            '_email_lower': email.lower(),
+            'name': name,
+            'avatar_url': avatar_url,
+            'last_used': last_used,
+            'is_active': is_active,
+        }
+        if aesgcm:
+            token_json = decrypt_db_value(token_json, aesgcm)
             if token_json:
-                acc['token'] = json.loads(token_json)
+                acc['token'] = json_loads(token_json)
                 
-            quota_json = decrypt_db_value(acc['quota_json'], master_key)
+            quota_json = decrypt_db_value(quota_json, aesgcm)
             if quota_json:
-                acc['quota'] = json.loads(quota_json)
+                acc['quota'] = json_loads(quota_json)
         
         accounts.append(acc)
-    conn.close()
     return accounts
 
+get_accounts.cache_clear = _load_accounts.cache_clear
+
+def get_account_emails() -> set:
+    """Return the stored account emails; reads the plaintext column only, no decryption."""
+    # Same error reporting as get_accounts(), so a missing DB isn't mistaken for zero accounts
+    try:
+        conn = _get_conn()
+        if conn is None:
+            print(f"[ERROR] Could not find {DB_NAME}. Searched standard locations.")
+            print(f"APPDATA: {os.getenv('APPDATA')}")
+            return set()
+        with _DB_LOCK:
+            return {row[0] for row in conn.execute("SELECT email FROM accounts")}
+    except sqlite3.Error as e:
+        print(f"[ERROR] Failed to read accounts DB: {e}")
+        return set()
+
+# (accounts list, {lowercased email: account}) for the current get_accounts() result
+_ACCOUNT_INDEX = (None, {})
+
+def get_accounts_index() -> dict:
+    """Return {lowercased email: account}, rebuilt only when get_accounts() reloads."""
+    global _ACCOUNT_INDEX
+    accounts = get_accounts()
+    if _ACCOUNT_INDEX[0] is not accounts:
+        # Built in reverse so the most recently used account wins on duplicates
+        _ACCOUNT_INDEX = (accounts, {acc['_email_lower']: acc for acc in reversed(accounts)})
+    return _ACCOUNT_INDEX[1]
+
+def find_account(email_pattern: str):
+    """Return the account with this exact email, else the first one whose email contains the pattern."""
+    pattern = email_pattern.lower()
+    target = get_accounts_index().get(pattern)
+    if target is None:
+        target = next((acc for acc in get_accounts() if pattern in acc['_email_lower']), None)
+    return target
+
+def _update_account_column(column: str, value: str, email: str):
+    """Write one encrypted column for an account; safe to call via asyncio.to_thread."""
+    with _DB_LOCK:
+        _get_conn().execute(f"UPDATE accounts SET {column} = ? WHERE email = ?", (value, email))
+
+def _update_cached_account(email: str, key: str, value):
+    """Apply a just-written value to the cached get_accounts() result instead of reloading it."""
+    acc = get_accounts_index().get(email.lower())
+    if acc is not None:
+        acc[key] = value
+
+@functools.lru_cache(maxsize=1)
 def get_antigravity_db_path():
     # Logic from paths.ts
     # On Windows: %APPDATA%/Antigravity IDE/User/state.vscdb
@@ -288,61 +508,63 @@ def inject_token(account):
     
     # Write to SQLite with transaction
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Start transaction
-        cursor.execute("BEGIN")
-        
-        try:
-            # Ensure table exists (it should)
-            cursor.execute("CREATE TABLE IF NOT EXISTS ItemTable (key TEXT PRIMARY KEY, value TEXT)")
-            
-            # Upsert
-            key = 'antigravityUnifiedStateSync.oauthToken'
-            cursor.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", (key, value_b64))
+        with closing(sqlite3.connect(db_path)) as conn:
+            cursor = conn.cursor()
             
-            # Also clean up auth status
-            auth_status = json.dumps({
-                "name": account.get('name') or account.get('email'),
-                "email": account['email'],
-                "apiKey": access_token
-            })
-            cursor.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", ('antigravityAuthStatus', auth_status))
-            cursor.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", ('antigravityOnboarding', 'true'))
-            cursor.execute("DELETE FROM ItemTable WHERE key = ?", ('google.antigravity',))
+            # Take the write lock up front so the whole injection is one transaction
+            cursor.execute("BEGIN IMMEDIATE")
             
-            # Commit transaction
-            conn.commit()
-            print(f"Injected token for {account['email']}")
-            return True
-        except Exception as e:
-            # Rollback on error
-            conn.rollback()
-            print(f"Injection failed, rolled back: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                # Commits on success, rolls back if any statement raises
+                with conn:
+                    # Ensure table exists (it should)
+                    cursor.execute("CREATE TABLE IF NOT EXISTS ItemTable (key TEXT PRIMARY KEY, value TEXT)")
+                    
+                    # Token plus auth status; one prepared upsert for all three keys
+                    auth_status = json_dumps({
+                        "name": account.get('name') or account.get('email'),
+                        "email": account['email'],
+                        "apiKey": access_token
+                    })
+                    cursor.executemany("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", [
+                        ('antigravityUnifiedStateSync.oauthToken', value_b64),
+                        ('antigravityAuthStatus', auth_status),
+                        ('antigravityOnboarding', 'true'),
+                    ])
+                    cursor.execute("DELETE FROM ItemTable WHERE key = ?", ('google.antigravity',))
+                
+                print(f"Injected token for {account['email']}")
+                return True
+            except Exception as e:
+                print(f"Injection failed, rolled back: {e}")
+                return False
     except Exception as e:
         print(f"Database connection failed: {e}")
         return False
 
-def kill_process(name_hints=["Antigravity", "Antigravity Manager"]):
+def kill_process(name_hints=("Antigravity", "Antigravity Manager")):
     # On Windows it might be Antigravity.exe or Code.exe
+    import psutil
+    hints = tuple(hint.lower() for hint in name_hints)
     killed = False
     for proc in psutil.process_iter(['pid', 'name']):
         try:
             pname = proc.info['name']
-            if pname and any(hint.lower() in pname.lower() for hint in name_hints):
+            if not pname:
+                continue
+            pname = pname.lower()
+            if any(hint in pname for hint in hints):
                 proc.kill()
                 killed = True
         except:
             pass
     return killed
 
-def start_process():
-    # Re-scan in case it was just closed/installed
-    exe_path = ANTIGRAVITY_EXE_PATH or find_antigravity_executable()
+def start_process(exe_path=None):
+    # Callers that kill the IDE first must resolve the path beforehand: the
+    # running-process scan can only find it while it is still up
+    if exe_path is None:
+        exe_path = get_antigravity_exe_path()
     
     if not exe_path or not os.path.exists(exe_path):
         print(f"Error: Could not locate Antigravity executable.")
@@ -358,19 +580,16 @@ def start_process():
         return False
 
 def switch_account(email_pattern):
-    accounts = get_accounts()
-    target = None
-    for acc in accounts:
-        if email_pattern.lower() in acc['email'].lower():
-            target = acc
-            break
-            
+    target = find_account(email_pattern)
     if not target:
         print(f"Account matching '{email_pattern}' not found.")
         return False
         
     print(f"Switching to {target['email']}...")
     
+    # Resolve the executable while the IDE is still running
+    exe_path = get_antigravity_exe_path()
+    
     # 1. Kill Process
     kill_process(["Antigravity.exe", "Antigravity"]) 
     time.sleep(1.0) # Give it a second
@@ -378,75 +597,108 @@ def switch_account(email_pattern):
     # 2. Inject
     if inject_token(target):
         # 3. Start Process
-        start_process()
+        start_process(exe_path)
         return True
     
     return False
 
+# Shared HTTP client so token refresh, project lookup and quota calls reuse
+# pooled keep-alive connections instead of a new TLS handshake per request
+_HTTP_CLIENT = None
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared AsyncClient, creating it on first use."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        # Imported lazily: httpx pulls in anyio/h11/certifi, which most commands never need
+        import httpx
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            # HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+            http2=importlib.util.find_spec('h2') is not None,
+            limits=httpx.Limits(max_keepalive_connections=10),
+        )
+    return _HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared AsyncClient; it is bound to the event loop that created it."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+def run_async(coro):
+    """asyncio.run() wrapper that closes the shared HTTP client before the loop shuts down."""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+    return asyncio.run(runner())
+
 async def refresh_access_token(refresh_token: str) -> dict:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        params = {
-            'client_id': CLIENT_ID,
-            'client_secret': CLIENT_SECRET,
-            'refresh_token': refresh_token,
-            'grant_type': 'refresh_token',
-        }
-        resp = await client.post(URL_TOKEN, data=params)
-        resp.raise_for_status()
-        return resp.json()
+    client = get_http_client()
+    params = {
+        'client_id': CLIENT_ID,
+        'client_secret': CLIENT_SECRET,
+        'refresh_token': refresh_token,
+        'grant_type': 'refresh_token',
+    }
+    resp = await client.post(URL_TOKEN, data=params)
+    resp.raise_for_status()
+    return resp.json()
 
 async def fetch_project_id(access_token: str) -> str:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'User-Agent': USER_AGENT,
-            'Content-Type': 'application/json',
-        }
-        body = {'metadata': {'ideType': 'ANTIGRAVITY'}}
-        resp = await client.post(URL_LOAD_PROJECT, json=body, headers=headers)
-        if resp.is_success:
-            return resp.json().get('cloudaicompanionProject')
+    client = get_http_client()
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'User-Agent': USER_AGENT,
+        'Content-Type': 'application/json',
+    }
+    body = {'metadata': {'ideType': 'ANTIGRAVITY'}}
+    resp = await client.post(URL_LOAD_PROJECT, json=body, headers=headers)
+    if resp.is_success:
+        return resp.json().get('cloudaicompanionProject')
     return None
 
 async def fetch_live_quota(access_token: str) -> dict:
     project_id = await fetch_project_id(access_token)
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'User-Agent': USER_AGENT,
-            'Content-Type': 'application/json',
+    client = get_http_client()
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'User-Agent': USER_AGENT,
+        'Content-Type': 'application/json',
+    }
+    payload = {}
+    if project_id:
+        payload['project'] = project_id
+        
+    resp = await client.post(URL_QUOTA, json=payload, headers=headers)
+    resp.raise_for_status()
+    
+    # Keep only the two quota fields per model, built in a single pass
+    models = json_loads(resp.content).get('models', {})
+    return {'models': {
+        name: {
+            'percentage': int(q_info.get('remainingFraction', 0) * 100),
+            'resetTime': q_info.get('resetTime', '')
         }
-        payload = {}
-        if project_id:
-            payload['project'] = project_id
-            
-        resp = await client.post(URL_QUOTA, json=payload, headers=headers)
-        resp.raise_for_status()
-        
-        raw_data = resp.json()
-        result = {'models': {}}
-        for name, info in raw_data.get('models', {}).items():
-            q_info = info.get('quotaInfo')
-            if q_info:
-                fraction = q_info.get('remainingFraction', 0)
-                result['models'][name] = {
-                    'percentage': int(fraction * 100),
-                    'resetTime': q_info.get('resetTime', '')
-                }
-        return result
+        for name, info in models.items()
+        if (q_info := info.get('quotaInfo'))
+    }}
 
-async def update_account_quota_live(email: str):
-    accounts = get_accounts()
-    target = next((a for a in accounts if email.lower() in a['email'].lower()), None)
+async def update_account_quota_live(email: str) -> bool:
+    """Refresh one account's token and quota; returns True if the new quota was saved."""
+    target = find_account(email)
     
     if not target:
         print(f"[ERROR] Account matching '{email}' not found in database.")
-        return
+        return False
         
     if not target.get('token'):
         print(f"[ERROR] Found account {target['email']}, but could not decrypt its token.")
         print("Possible reason: Python CLI cannot access the Master Key or DPAPI is locked.")
-        return
+        return False
 
     print(f"Refreshing quota for {target['email']}...")
     try:
@@ -458,22 +710,20 @@ async def update_account_quota_live(email: str):
         new_quota = await fetch_live_quota(new_access_token)
         
         # 3. Save to DB
-        db_path = find_db_path()
         master_key = get_master_key()
         if not master_key:
-            print("Cannot update DB: Master Key missing.")
-            return
+            print(f"Cannot update DB for {target['email']}: Master Key missing.")
+            return False
 
-        encrypted_quota = encrypt_db_value(json.dumps(new_quota), master_key)
+        encrypted_quota = encrypt_db_value(json_dumps(new_quota), get_cipher(master_key))
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE accounts SET quota_json = ? WHERE email = ?", (encrypted_quota, target['email']))
-        conn.commit()
-        conn.close()
-        print("Quota updated successfully.")
+        await asyncio.to_thread(_update_account_column, 'quota_json', encrypted_quota, target['email'])
+        _update_cached_account(target['email'], 'quota', new_quota)
+        print(f"Quota updated successfully for {target['email']}.")
+        return True
     except Exception as e:
-        print(f"Failed to refresh quota: {e}")
+        print(f"Failed to refresh quota for {target['email']}: {e}")
+        return False
 
 def add_to_windows_path(path_to_add: str) -> bool:
     if not winreg:
@@ -519,19 +769,18 @@ def get_ide_accounts():
         return []
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Read the storage JSON that contains account info
-        cursor.execute("SELECT value FROM ItemTable WHERE key = 'antigravityAuthStatus'")
-        row = cursor.fetchone()
-        conn.close()
+        with closing(sqlite3.connect(db_path)) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            # Read the storage JSON that contains account info
+            cursor.execute("SELECT value FROM ItemTable WHERE key = 'antigravityAuthStatus'")
+            row = cursor.fetchone()
         
         if not row:
             return []
             
-        auth_data = json.loads(row['value'])
+        auth_data = json_loads(row['value'])
         # IDE stores current active account, not a full list
         # We'll return it as a single-item list for consistency
         return [{
@@ -546,13 +795,12 @@ def get_ide_accounts():
 def sync_accounts_from_ide():
     """Import accounts from IDE to CLI database."""
     ide_accounts = get_ide_accounts()
-    cli_accounts = get_accounts()
     
     if not ide_accounts:
         print("No accounts found in IDE.")
         return
     
-    cli_emails = {acc['email'] for acc in cli_accounts}
+    cli_emails = get_account_emails()
     new_accounts = [acc for acc in ide_accounts if acc['email'] not in cli_emails]
     
     if not new_accounts:
@@ -570,10 +818,9 @@ def sync_accounts_from_ide():
 
 def compare_accounts():
     """Show differences between CLI and IDE accounts."""
-    cli_accounts = get_accounts()
     ide_accounts = get_ide_accounts()
     
-    cli_emails = {acc['email'] for acc in cli_accounts}
+    cli_emails = get_account_emails()
     ide_emails = {acc['email'] for acc in ide_accounts}
     
     only_in_cli = cli_emails - ide_emails
@@ -586,8 +833,11 @@ def compare_accounts():
         'both': in_both
     }
 
-def is_token_expired(token_data: dict) -> bool:
-    """Check if access token has expired based on expiry_timestamp."""
+def is_token_expired(token_data: dict, now_ms: int = None) -> bool:
+    """Check if access token has expired based on expiry_timestamp.
+    
+    Pass now_ms when checking many tokens so the clock is read once.
+    """
     if not token_data:
         return True
     
@@ -596,10 +846,11 @@ def is_token_expired(token_data: dict) -> bool:
         return True
     
     # expiry_timestamp is in milliseconds
-    now_ms = int(time.time() * 1000)
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
     return now_ms >= expiry
 
-async def validate_and_refresh_account(account: dict) -> dict:
+async def validate_and_refresh_account(account: dict, now_ms: int = None) -> dict:
     """Check token validity and refresh if needed. Returns status dict."""
     email = account['email']
     token_data = account.get('token')
@@ -615,7 +866,7 @@ async def validate_and_refresh_account(account: dict) -> dict:
         result['error'] = 'No token data'
         return result
     
-    if not is_token_expired(token_data):
+    if not is_token_expired(token_data, now_ms):
         result['valid'] = True
         return result
     
@@ -630,7 +881,6 @@ async def validate_and_refresh_account(account: dict) -> dict:
         new_tokens = await refresh_access_token(refresh_token)
         
         # Update in database
-        db_path = find_db_path()
         master_key = get_master_key()
         
         if not master_key:
@@ -642,13 +892,11 @@ async def validate_and_refresh_account(account: dict) -> dict:
         updated_token['access_token'] = new_tokens['access_token']
         updated_token['expiry_timestamp'] = int(time.time() * 1000) + (new_tokens.get('expires_in', 3600) * 1000)
         
-        encrypted_token = encrypt_db_value(json.dumps(updated_token), master_key)
+        encrypted_token = encrypt_db_value(json_dumps(updated_token), get_cipher(master_key))
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE accounts SET token_json = ? WHERE email = ?", (encrypted_token, email))
-        conn.commit()
-        conn.close()
+        await asyncio.to_thread(_update_account_column, 'token_json', encrypted_token, email)
+        account['token'] = updated_token
+        _update_cached_account(email, 'token', updated_token)
         
         result['valid'] = True
         result['refreshed'] = True
@@ -659,15 +907,22 @@ async def validate_and_refresh_account(account: dict) -> dict:
         return result
 
 async def validate_all_accounts():
-    """Validate and refresh all accounts. Returns summary."""
+    """Validate and refresh all accounts concurrently. Returns summary."""
+    # Tokens come from the cached, already-decrypted accounts, so expiry checks
+    # for the (usually unexpired) majority cost no extra AES/JSON work
     accounts = get_accounts()
-    results = []
-    
-    for acc in accounts:
-        result = await validate_and_refresh_account(acc)
-        results.append(result)
+    now_ms = int(time.time() * 1000)
+    results = await asyncio.gather(
+        *(validate_and_refresh_account(acc, now_ms) for acc in accounts),
+        return_exceptions=True
+    )
     
-    return results
+    # Keep one status dict per account even if a task raised unexpectedly
+    return [
+        {'email': acc['email'], 'valid': False, 'refreshed': False, 'error': str(result)}
+        if isinstance(result, Exception) else result
+        for acc, result in zip(accounts, results)
+    ]
 
 def remove_account(email_pattern: str) -> bool:
     """Remove an account from the database."""
@@ -676,23 +931,15 @@ def remove_account(email_pattern: str) -> bool:
         print("Database not found.")
         return False
     
-    accounts = get_accounts()
-    target = None
-    for acc in accounts:
-        if email_pattern.lower() in acc['email'].lower():
-            target = acc
-            break
-    
+    target = find_account(email_pattern)
     if not target:
         print(f"Account matching '{email_pattern}' not found.")
         return False
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM accounts WHERE email = ?", (target['email'],))
-        conn.commit()
-        conn.close()
+        with _DB_LOCK:
+            _get_conn().execute("DELETE FROM accounts WHERE email = ?", (target['email'],))
+        get_accounts.cache_clear()
         return True
     except Exception as e:
         print(f"Failed to remove account: {e}")
@@ -702,19 +949,29 @@ def get_alias_path():
     """Get path to alias storage file."""
     return os.path.join(USER_DATA_DIR, 'aliases.json')
 
+# (mtime_ns, aliases) of the last aliases.json read; reset by set_alias/remove_alias
+_ALIAS_CACHE = (None, {})
+
 def get_aliases() -> dict:
     """Load account aliases from file."""
+    global _ALIAS_CACHE
     alias_path = get_alias_path()
-    if not os.path.exists(alias_path):
-        return {}
     try:
-        with open(alias_path, 'r') as f:
-            return json.load(f)
-    except:
+        mtime = os.stat(alias_path).st_mtime_ns
+    except OSError:
         return {}
+    if _ALIAS_CACHE[0] != mtime:
+        try:
+            with open(alias_path, 'r') as f:
+                _ALIAS_CACHE = (mtime, json_loads(f.read()))
+        except:
+            return {}
+    # Copy so callers can edit the result without touching the cache
+    return dict(_ALIAS_CACHE[1])
 
 def set_alias(alias: str, email: str) -> bool:
     """Set an alias for an account."""
+    global _ALIAS_CACHE
     aliases = get_aliases()
     aliases[alias] = email
     
@@ -723,7 +980,8 @@ def set_alias(alias: str, email: str) -> bool:
     
     try:
         with open(alias_path, 'w') as f:
-            json.dump(aliases, f, indent=2)
+            f.write(json_dumps(aliases, indent=True))
+        _ALIAS_CACHE = (None, {})
         return True
     except Exception as e:
         print(f"Failed to save alias: {e}")
@@ -731,6 +989,7 @@ def set_alias(alias: str, email: str) -> bool:
 
 def remove_alias(alias: str) -> bool:
     """Remove an alias."""
+    global _ALIAS_CACHE
     aliases = get_aliases()
     if alias not in aliases:
         return False
@@ -740,7 +999,8 @@ def remove_alias(alias: str) -> bool:
     
     try:
         with open(alias_path, 'w') as f:
-            json.dump(aliases, f, indent=2)
+            f.write(json_dumps(aliases, indent=True))
+        _ALIAS_CACHE = (None, {})
         return True
     except Exception as e:
         print(f"Failed to remove alias: {e}")
@@ -761,17 +1021,16 @@ def export_accounts(output_path: str) -> bool:
         return False
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM accounts")
-        rows = cursor.fetchall()
-        conn.close()
+        with _DB_LOCK:
+            cursor = _get_conn().cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT * FROM accounts")
+            rows = cursor.fetchall()
         
         export_data = [dict(row) for row in rows]
         
         with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+            f.write(json_dumps(export_data, indent=True))
         
         return True
     except Exception as e:
@@ -791,69 +1050,71 @@ def import_accounts(input_path: str) -> bool:
     
     try:
         with open(input_path, 'r') as f:
-            import_data = json.load(f)
+            import_data = json_loads(f.read())
         
         # Validate structure
         if not isinstance(import_data, list):
             print("Invalid backup format: expected list of accounts")
             return False
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        # The whole transaction runs under the shared-connection lock
+        with _DB_LOCK:
+            conn = _get_conn()
+            cursor = conn.cursor()
         
-        # Start transaction
-        cursor.execute("BEGIN")
+            # Start transaction
+            cursor.execute("BEGIN")
         
-        imported = 0
-        try:
-            for acc in import_data:
-                # Validate required fields
-                if not isinstance(acc, dict):
-                    print(f"Skipping invalid entry (not a dict)")
-                    continue
+            try:
+                # Commits on success, rolls back if anything below raises
+                with conn:
+                    existing = {row[0] for row in cursor.execute("SELECT email FROM accounts")}
+                    rows = []
+                    for acc in import_data:
+                        # Validate required fields
+                        if not isinstance(acc, dict):
+                            print(f"Skipping invalid entry (not a dict)")
+                            continue
                     
-                if 'email' not in acc:
-                    print(f"Skipping entry without email")
-                    continue
+                        if 'email' not in acc:
+                            print(f"Skipping entry without email")
+                            continue
                 
-                # Sanitize email
-                email = str(acc['email']).strip()
-                if not email or '@' not in email:
-                    print(f"Skipping invalid email: {email}")
-                    continue
+                        # Sanitize email
+                        email = str(acc['email']).strip()
+                        if not email or '@' not in email:
+                            print(f"Skipping invalid email: {email}")
+                            continue
                 
-                # Check if account already exists
-                cursor.execute("SELECT email FROM accounts WHERE email = ?", (email,))
-                if cursor.fetchone():
-                    print(f"Skipping {email} (already exists)")
-                    continue
+                        # Check if account already exists (in the DB or earlier in this file)
+                        if email in existing:
+                            print(f"Skipping {email} (already exists)")
+                            continue
+                        existing.add(email)
                 
-                # Insert account with validated data
-                cursor.execute(
-                    "INSERT INTO accounts (email, token_json, quota_json, name, avatar_url, last_used, is_active) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        email,
-                        acc.get('token_json', ''),
-                        acc.get('quota_json', ''),
-                        acc.get('name', ''),
-                        acc.get('avatar_url', ''),
-                        int(acc.get('last_used', 0)),
-                        0  # Never set imported accounts as active
+                        # Queue account with validated data
+                        rows.append((
+                            email,
+                            acc.get('token_json', ''),
+                            acc.get('quota_json', ''),
+                            acc.get('name', ''),
+                            acc.get('avatar_url', ''),
+                            int(acc.get('last_used', 0)),
+                            0  # Never set imported accounts as active
+                        ))
+            
+                    cursor.executemany(
+                        "INSERT INTO accounts (email, token_json, quota_json, name, avatar_url, last_used, is_active) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows
                     )
-                )
-                imported += 1
+                    imported = len(rows)
             
-            # Commit transaction
-            conn.commit()
-            print(f"Imported {imported} account(s).")
-            return True
-        except Exception as e:
-            # Rollback on error
-            conn.rollback()
-            print(f"Import failed during transaction, rolled back: {e}")
-            return False
-        finally:
-            conn.close()
+                get_accounts.cache_clear()
+                print(f"Imported {imported} account(s).")
+                return True
+            except Exception as e:
+                print(f"Import failed during transaction, rolled back: {e}")
+                return False
             
     except json.JSONDecodeError as e:
         print(f"Invalid JSON in backup file: {e}")
@@ -919,7 +1180,7 @@ def run_diagnostics() -> dict:
         results['ide_db'] = {'status': 'ok', 'path': ide_db}
     
     # Check executable
-    exe = ANTIGRAVITY_EXE_PATH
+    exe = get_antigravity_exe_path()
     if exe and os.path.exists(exe):
         results['exe'] = {'status': 'ok', 'path': exe}
     
@@ -0,0 +1,636 @@
+# Command implementations for the agm CLI; cli.main imports this module lazily.
+import functools
+import typer
+
+
+class _LazyConsole:
+    """Stand-in for rich's Console that imports and builds it on first use."""
+    _console = None
+
+    def _resolve(self):
+        """Return the real Console, for APIs that need more than attribute access."""
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return _LazyConsole._console
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+# rich.console is only imported once something is printed, so `agm --help` skips it
+console = _LazyConsole()
+
+# Model families shown in quota summaries: (key, substrings required, substrings excluded)
+_FAMILIES = (
+    ('g31', ('gemini-3.1-pro',), ()),
+    ('gp', ('gemini-3', 'pro'), ('3.1',)),
+    ('gf', ('gemini-3', 'flash'), ()),
+    ('c', ('claude',), ()),
+)
+
+@functools.lru_cache(maxsize=256)
+def _classify(nl):
+    """Return the keys of every family a lowercased model name belongs to."""
+    return tuple(
+        key for key, include, exclude in _FAMILIES
+        if all(s in nl for s in include) and not any(s in nl for s in exclude)
+    )
+
+def _family_minimums(quota):
+    """Return the lowest quota percentage per family key."""
+    mins = {}
+    for n, m in quota.items():
+        pct = m['percentage']
+        for key in _classify(n.lower()):
+            cur = mins.get(key)
+            if cur is None or pct < cur:
+                mins[key] = pct
+    return mins
+
+def _percentage_key(item):
+    """Sort key for (model name, quota info) pairs: the quota percentage."""
+    return item[1].get('percentage', 0)
+
+_INTERACTIVE_CHOICES = (
+    "List all accounts",
+    "Switch account",
+    "Refresh quotas",
+    "Validate tokens",
+    "Show status",
+    "Sync status",
+    "Auto-switch to best account",
+    "Manage aliases",
+    "Export/Import",
+    "Run diagnostics",
+    "Setup PATH",
+    "Exit",
+)
+
+def interactive_mode():
+    """Show interactive menu for selecting actions."""
+    import questionary
+    handlers = {
+        "List all accounts": list_cmd,
+        "Switch account": interactive_switch,
+        "Refresh quotas": interactive_refresh,
+        "Validate tokens": validate_cmd,
+        "Show status": status_cmd,
+        "Sync status": sync_cmd,
+        "Auto-switch to best account": interactive_auto_switch,
+        "Manage aliases": interactive_aliases,
+        "Export/Import": interactive_export_import,
+        "Run diagnostics": doctor_cmd,
+        "Setup PATH": setup_path_cmd,
+    }
+    try:
+        while True:
+            console.print("\n[bold cyan]Antigravity Manager - Interactive Mode[/bold cyan]\n")
+            
+            action = questionary.select(
+                "What would you like to do?",
+                choices=list(_INTERACTIVE_CHOICES)
+            ).ask()
+            
+            if not action or action == "Exit":
+                console.print("[yellow]Goodbye![/yellow]")
+                break
+            
+            # Execute based on selection with error handling
+            try:
+                handlers[action]()
+            except Exception as e:
+                console.print(f"[red]An error occurred: {e}[/red]")
+                console.print("[yellow]Please try again or report this issue.[/yellow]")
+            
+            # Ask to continue
+            if not questionary.confirm("\nContinue?", default=True).ask():
+                break
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Goodbye![/yellow]")
+    except Exception as e:
+        console.print(f"[red]Fatal error in interactive mode: {e}[/red]")
+
+def interactive_switch():
+    """Interactive account switching."""
+    import questionary
+    from cli.core import get_accounts
+    accounts = get_accounts()
+    if not accounts:
+        console.print("[red]No accounts found[/red]")
+        return
+    
+    choices = [f"{acc['email']}" for acc in accounts]
+    
+    selected = questionary.select(
+        "Select account to switch to:",
+        choices=choices
+    ).ask()
+    
+    if selected:
+        switch_cmd(selected)
+
+def interactive_refresh():
+    """Interactive quota refresh."""
+    import questionary
+    from cli.core import get_accounts
+    choices = [
+        "Refresh all accounts",
+        "Refresh specific account",
+    ]
+    
+    action = questionary.select(
+        "Refresh options:",
+        choices=choices
+    ).ask()
+    
+    if "all" in action.lower():
+        refresh_all_cmd()
+    else:
+        accounts = get_accounts()
+        if not accounts:
+            console.print("[red]No accounts found[/red]")
+            return
+        
+        selected = questionary.select(
+            "Select account:",
+            choices=[acc['email'] for acc in accounts]
+        ).ask()
+        
+        if selected:
+            refresh_cmd(selected)
+
+def interactive_auto_switch():
+    """Interactive auto-switch configuration."""
+    import questionary
+    min_quota = questionary.text(
+        "Minimum quota percentage?",
+        default="50"
+    ).ask()
+    
+    model_choices = ["Any model", "Gemini 3.1 Pro", "Gemini 3 Pro", "Gemini Flash", "Claude"]
+    model_pref = questionary.select(
+        "Prefer specific model?",
+        choices=model_choices
+    ).ask()
+    
+    if model_pref == "Any model":
+        model = None
+    elif model_pref == "Gemini 3.1 Pro":
+        model = "gemini-3.1-pro-preview"
+    elif model_pref == "Gemini 3 Pro":
+        model = "gemini-3-pro"
+    elif model_pref == "Gemini Flash":
+        model = "flash"
+    else:
+        model = model_pref.lower()
+    
+    auto_switch_cmd(int(min_quota), model)
+
+def interactive_aliases():
+    """Interactive alias management."""
+    import questionary
+    from cli.core import get_accounts, get_aliases
+    
+    choices = [
+        "View all aliases",
+        "Add new alias",
+        "Remove alias",
+    ]
+    
+    action = questionary.select(
+        "Alias management:",
+        choices=choices
+    ).ask()
+    
+    if "View" in action:
+        alias_cmd(None)
+    elif "Add" in action:
+        alias_name = questionary.text("Alias name:").ask()
+        accounts = get_accounts()
+        email = questionary.select(
+            "Select account:",
+            choices=[acc['email'] for acc in accounts]
+        ).ask()
+        if alias_name and email:
+            alias_cmd(alias_name, email)
+    elif "Remove" in action:
+        aliases = get_aliases()
+        if not aliases:
+            console.print("[yellow]No aliases to remove[/yellow]")
+            return
+        alias_name = questionary.select(
+            "Select alias to remove:",
+            choices=list(aliases.keys())
+        ).ask()
+        if alias_name:
+            unalias_cmd(alias_name)
+
+def interactive_export_import():
+    """Interactive export/import."""
+    import questionary
+    action = questionary.select(
+        "Export or Import?",
+        choices=["Export accounts", "Import from backup"]
+    ).ask()
+    
+    if "Export" in action:
+        filename = questionary.text(
+            "Output filename:",
+            default="accounts_backup.json"
+        ).ask()
+        if filename:
+            export_cmd(filename)
+    else:
+        filename = questionary.text(
+            "Input filename:",
+            default="accounts_backup.json"
+        ).ask()
+        if filename:
+            import_backup_cmd(filename)
+
+def _build_table():
+    """Build the accounts summary table shown by list and watch."""
+    from rich import box
+    from rich.table import Table
+    import time
+    from cli.core import get_accounts, is_token_expired
+    accounts = get_accounts()
+    now_ms = int(time.time() * 1000)
+    
+    table = Table(
+        title="[bold magenta]Antigravity Accounts Summary[/bold magenta]",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        title_style="bold magenta",
+        padding=(0, 2),
+        show_footer=False,
+        border_style="dim"
+    )
+    
+    table.add_column("Account (Email)", style="white", no_wrap=True)
+    table.add_column("Status", justify="center")
+    table.add_column("G 3.1 Pro", style="magenta", justify="center")
+    table.add_column("G 3 Pro", style="bright_magenta", justify="center")
+    table.add_column("G Flash", style="yellow", justify="center")
+    table.add_column("Claude", style="blue", justify="center")
+    
+    # Highlight low quotas
+    def highlight(pct):
+        if pct is None: return "[dim]-[/dim]"
+        if pct < 20: return f"[bold red]{pct}%[/bold red]"
+        if pct < 50: return f"[yellow]{pct}%[/yellow]"
+        return f"[green]{pct}%[/green]"
+
+    for acc in accounts:
+        status_text = "[bold green]Active[/bold green]" if acc.get('is_active') else "[dim]—[/dim]"
+        quota = acc.get('quota', {}).get('models', {})
+        
+        # Check token expiry
+        token_expired = is_token_expired(acc.get('token'), now_ms)
+        if token_expired:
+            status_text = "[bold red]⚠ Expired[/bold red]"
+        
+        mins = _family_minimums(quota)
+        
+        g31_str = highlight(mins.get('g31'))
+        gp_str = highlight(mins.get('gp'))
+        gf_str = highlight(mins.get('gf'))
+        c_str = highlight(mins.get('c'))
+        
+        table.add_row(acc['email'], status_text, g31_str, gp_str, gf_str, c_str)
+    
+    return table
+
+def list_cmd():
+    """List all accounts with summarized quotas."""
+    console.print("\n", _build_table(), "\n")
+
+def info_cmd(email: str):
+    """Show detailed quota information for a specific account."""
+    from rich.table import Table
+    from cli.core import find_account, resolve_email_or_alias
+    email = resolve_email_or_alias(email)
+    
+    target = find_account(email)
+            
+    if not target:
+        console.print(f"[red]Account '{email}' not found.[/red]")
+        return
+
+    console.print(f"\n[bold cyan]Account details: {target['email']}[/bold cyan]")
+    
+    quota_data = target.get('quota', {}).get('models', {})
+    if not quota_data:
+        console.print("[yellow]No quota data available for this account. Refresh in UI first.[/yellow]")
+        return
+
+    table = Table(title="Model Quotas", show_header=True, header_style="bold")
+    table.add_column("Provider", style="dim", width=12)
+    table.add_column("Model Name", style="white")
+    table.add_column("Score", style="bold", justify="right")
+    table.add_column("Reset Time", style="dim")
+
+    # Sort and group
+    sorted_models = sorted(quota_data.items(), key=_percentage_key, reverse=True)
+    for name, info in sorted_models:
+        pct = info.get('percentage', 0)
+        reset = info.get('resetTime', 'N/A')
+        color = "green" if pct > 50 else "yellow" if pct > 20 else "red"
+        
+        display_name = name.replace('cloudaicompanion.googleapis.com/', '')
+        nl = name.lower()
+        provider = "GOOGLE" if "gemini" in nl else "ANTHROPIC" if "claude" in nl else "OTHER"
+        
+        table.add_row(provider, display_name, f"[{color}]{pct}%[/{color}]", reset)
+
+    console.print(table)
+
+def switch_cmd(email: str):
+    """Switch to an account by email/pattern/alias."""
+    from cli.core import resolve_email_or_alias, switch_account
+    email = resolve_email_or_alias(email)
+    
+    if switch_account(email):
+        console.print(f"[bold green]Switch completed successfully.[/bold green]")
+    else:
+        console.print("[bold red]Switch failed.[/bold red]")
+        raise typer.Exit(code=1)
+
+def refresh_cmd(email: str):
+    """Fetch live quotas from Google API for an account."""
+    from cli.core import update_account_quota_live, resolve_email_or_alias, run_async
+    email = resolve_email_or_alias(email)
+    run_async(update_account_quota_live(email))
+
+def refresh_all_cmd():
+    """Refresh quotas for ALL stored accounts at once."""
+    from cli.core import update_account_quota_live, get_accounts, run_async
+    
+    accounts = get_accounts()
+    console.print(f"[bold yellow]Starting bulk refresh for {len(accounts)} accounts...[/bold yellow]\n")
+    
+    async def run_all():
+        import asyncio
+        # Refreshes are independent HTTP round-trips; overlap them, at most 8 at a time
+        sem = asyncio.Semaphore(8)
+        
+        async def one(acc):
+            async with sem:
+                try:
+                    # update_account_quota_live logs its own failures and reports them as False
+                    if await update_account_quota_live(acc['email']):
+                        return acc['email'], None
+                    return acc['email'], "refresh failed"
+                except Exception as e:
+                    console.print(f"[red]✗ Error refreshing {acc['email']}: {e}[/red]")
+                    return acc['email'], str(e)
+        
+        results = await asyncio.gather(*(one(acc) for acc in accounts))
+        errors = [(email, err) for email, err in results if err is not None]
+        return len(results) - len(errors), errors
+            
+    success_count, errors = run_async(run_all())
+    
+    console.print(f"\n[bold green]Completed: {success_count} successful[/bold green]")
+    if errors:
+        console.print(f"[bold red]{len(errors)} failed[/bold red]")
+        for email, _ in errors:
+            console.print(f"  [red]✗ {email}[/red]")
+
+
+def validate_cmd():
+    """Check all tokens and auto-refresh expired ones."""
+    from cli.core import validate_all_accounts, run_async
+    
+    console.print("[bold yellow]Validating all account tokens...[/bold yellow]\n")
+    
+    results = run_async(validate_all_accounts())
+    
+    valid_count = 0
+    refreshed_count = 0
+    error_count = 0
+    
+    for result in results:
+        email = result['email']
+        
+        if result['error']:
+            console.print(f"[red]✗[/red] {email}: {result['error']}")
+            error_count += 1
+        elif result['refreshed']:
+            console.print(f"[green]✓[/green] {email}: Token refreshed successfully")
+            refreshed_count += 1
+        elif result['valid']:
+            console.print(f"[green]✓[/green] {email}: Token valid")
+            valid_count += 1
+    
+    console.print(f"\n[bold]Summary:[/bold]")
+    console.print(f"  Valid: {valid_count}")
+    console.print(f"  Refreshed: {refreshed_count}")
+    if error_count > 0:
+        console.print(f"  [red]Errors: {error_count}[/red]")
+
+def sync_cmd():
+    """Show sync status between CLI database and IDE."""
+    from cli.core import compare_accounts
+    
+    console.print("\n[bold cyan]Account Sync Status[/bold cyan]\n")
+    
+    diff = compare_accounts()
+    
+    if diff['both']:
+        console.print("[bold green]✓ In Both (CLI + IDE):[/bold green]")
+        for email in diff['both']:
+            console.print(f"  • {email}")
+        console.print()
+    
+    if diff['cli_only']:
+        console.print("[bold yellow]⚠ Only in CLI Database:[/bold yellow]")
+        for email in diff['cli_only']:
+            console.print(f"  • {email}")
+        console.print("  [dim]These accounts won't appear in the IDE until you switch to them.[/dim]\n")
+    
+    if diff['ide_only']:
+        console.print("[bold magenta]⚠ Only in IDE:[/bold magenta]")
+        for email in diff['ide_only']:
+            console.print(f"  • {email}")
+        console.print("  [dim]This is the currently active account in the IDE.[/dim]\n")
+    
+    if not diff['cli_only'] and not diff['ide_only']:
+        console.print("[bold green]Everything is in sync! ✓[/bold green]")
+
+def remove_cmd(email: str):
+    """Remove an account from the database."""
+    from cli.core import remove_account, resolve_email_or_alias
+    email = resolve_email_or_alias(email)
+    
+    if typer.confirm(f"Remove {email} from database?"):
+        if remove_account(email):
+            console.print(f"[green]Removed {email}[/green]")
+        else:
+            console.print("[red]Failed to remove account[/red]")
+    else:
+        console.print("Cancelled.")
+
+def alias_cmd(name: str, email: str = None):
+    """Set or view account aliases."""
+    from rich.table import Table
+    from cli.core import get_aliases, set_alias
+    
+    if email is None:
+        # Show all aliases
+        aliases = get_aliases()
+        if not aliases:
+            console.print("[yellow]No aliases set.[/yellow]")
+            return
+        
+        table = Table(title="Account Aliases")
+        table.add_column("Alias", style="cyan")
+        table.add_column("Email", style="magenta")
+        
+        for alias_name, email_addr in aliases.items():
+            table.add_row(alias_name, email_addr)
+        
+        console.print(table)
+    else:
+        # Set alias
+        if set_alias(name, email):
+            console.print(f"[green]Alias '{name}' → {email}[/green]")
+        else:
+            console.print("[red]Failed to set alias[/red]")
+
+def unalias_cmd(name: str):
+    """Remove an alias."""
+    from cli.core import remove_alias
+    
+    if remove_alias(name):
+        console.print(f"[green]Removed alias '{name}'[/green]")
+    else:
+        console.print(f"[yellow]Alias '{name}' not found[/yellow]")
+
+def export_cmd(output: str = "accounts_backup.json"):
+    """Export all accounts to a backup file."""
+    from cli.core import export_accounts
+    
+    if export_accounts(output):
+        console.print(f"[green]Exported accounts to {output}[/green]")
+    else:
+        console.print("[red]Export failed[/red]")
+
+def import_backup_cmd(input: str):
+    """Import accounts from a backup file."""
+    from cli.core import import_accounts
+    
+    if import_accounts(input):
+        console.print("[green]Import completed[/green]")
+    else:
+        console.print("[red]Import failed[/red]")
+
+def auto_switch_cmd(min_quota: int = 50, model: str = None):
+    """Automatically switch to the best available account."""
+    from cli.core import auto_select_best_account, switch_account
+    
+    console.print(f"[yellow]Searching for best account (min quota: {min_quota}%)...[/yellow]")
+    
+    best = auto_select_best_account(min_quota, model)
+    
+    if not best:
+        console.print(f"[red]No account found with quota >= {min_quota}%[/red]")
+        return
+    
+    console.print(f"[green]Best account: {best['email']}[/green]")
+    
+    if typer.confirm("Switch to this account?"):
+        if switch_account(best['email']):
+            console.print("[bold green]Switch completed![/bold green]")
+        else:
+            console.print("[bold red]Switch failed[/bold red]")
+
+def status_cmd():
+    """Show quick overview of active account and quotas."""
+    from cli.core import get_accounts
+    
+    accounts = get_accounts()
+    active = next((a for a in accounts if a.get('is_active')), None)
+    
+    if not active:
+        # Pick first account
+        active = accounts[0] if accounts else None
+    
+    if not active:
+        console.print("[red]No accounts found[/red]")
+        return
+    
+    console.print(f"\n[bold cyan]Active Account:[/bold cyan] {active['email']}")
+    
+    quota = active.get('quota', {}).get('models', {})
+    if quota:
+        mins = _family_minimums(quota)
+        
+        if 'g31' in mins: console.print(f"[magenta]Gemini 3.1 Pro:[/magenta] {mins['g31']}%")
+        if 'gp' in mins: console.print(f"[bright_magenta]Gemini 3 Pro:[/bright_magenta] {mins['gp']}%")
+        console.print(f"[blue]Claude:[/blue] {mins.get('c', 0)}%")
+    else:
+        console.print("[yellow]No quota data available[/yellow]")
+    
+    console.print()
+
+def doctor_cmd():
+    """Run system diagnostics."""
+    from cli.core import run_diagnostics
+    
+    console.print("\n[bold cyan]Running diagnostics...[/bold cyan]\n")
+    
+    results = run_diagnostics()
+    
+    for component, data in results.items():
+        status = data['status']
+        icon = "✓" if status == 'ok' else "⚠" if status == 'warning' else "✗"
+        color = "green" if status == 'ok' else "yellow" if status == 'warning' else "red"
+        
+        console.print(f"[{color}]{icon}[/{color}] {component.upper()}: ", end="")
+        
+        if status == 'ok':
+            if 'path' in data:
+                console.print(f"[dim]{data['path']}[/dim]")
+            elif 'count' in data:
+                console.print(f"{data['count']} accounts")
+            elif 'version' in data:
+                console.print(f"{data['version'].split()[0]}")
+            else:
+                console.print("OK")
+        else:
+            console.print(f"[{color}]{status.upper()}[/{color}]")
+    
+    console.print()
+
+def watch_cmd(interval: int = 10):
+    """Live monitoring of account quotas (updates every N seconds)."""
+    import time
+    from rich.live import Live
+    
+    try:
+        console.clear()
+        console.print(f"[dim]Press Ctrl+C to stop. Refreshing every {interval}s...[/dim]\n")
+        # Redraw the table in place each tick instead of clearing and reprinting the screen;
+        # overflow stays visible so tables taller than the terminal still show every account
+        with Live(_build_table(), console=console._resolve(), auto_refresh=False, vertical_overflow="visible") as live:
+            while True:
+                time.sleep(interval)
+                live.update(_build_table(), refresh=True)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped monitoring.[/yellow]")
+
+def setup_path_cmd():
+    """Add the current directory to Windows PATH to use 'agm' command globally."""
+    import os
+    from cli.core import add_to_windows_path
+    
+    current_dir = os.getcwd()
+    if typer.confirm(f"Add '{current_dir}' to your User PATH?"):
+        if add_to_windows_path(current_dir):
+            console.print("[bold green]Success![/bold green] Path updated.")
+            console.print("[yellow]Please RESTART your terminal/IDE for changes to take effect.[/yellow]")
+        else:
+            console.print("[bold red]Failed to update PATH.[/bold red]")
+    else:
+        console.print("Operation cancelled.")
@@ -1,19 +1,55 @@
 
 # a:\UnityProjects\ManagerFork\AntigravityManager\cli\proto_utils.py
-import struct
 import base64
 
+# Single-byte varints (every tag and most lengths here) are shared constants
+_SMALL_VARINTS = tuple(bytes((v,)) for v in range(128))
+
 def encode_varint(value: int) -> bytes:
     if value < 0:
         raise ValueError("Varint encoding only supports non-negative integers. Use zigzag encoding for signed values.")
-    
-    buf = []
-    val = value
-    while val >= 128:
-        buf.append((val & 0x7F) | 0x80)
-        val >>= 7
-    buf.append(val)
-    return bytes(buf)
+    if value < 128:
+        return _SMALL_VARINTS[value]
+    
+    buf = bytearray(10)
+    i = 0
+    while value >= 128:
+        buf[i] = (value & 0x7F) | 0x80
+        i += 1
+        value >>= 7
+    buf[i] = value
+    return bytes(buf[:i + 1])
+
+# Pre-encoded tags for field numbers 1-15 (single-byte) as varint (0) or length-delimited (2)
+_TAGS = {(fn, wt): encode_varint((fn << 3) | wt) for fn in range(1, 16) for wt in (0, 2)}
+
+
+def _write_varint(ba: bytearray, value: int) -> None:
+    while value >= 128:
+        ba.append((value & 0x7F) | 0x80)
+        value >>= 7
+    ba.append(value)
+
+
+def _write_len_delim_field(ba: bytearray, field_num: int, data) -> None:
+    tag = _TAGS.get((field_num, 2))
+    if tag is None:
+        _write_varint(ba, (field_num << 3) | 2)
+    else:
+        ba += tag
+    _write_varint(ba, len(data))
+    ba += data
+
+
+def _write_oauth_info(ba: bytearray, access_token: str, refresh_token: str, expiry: int) -> None:
+    _write_len_delim_field(ba, 1, access_token.encode('utf-8'))
+    ba += _BEARER_FIELD
+    _write_len_delim_field(ba, 3, refresh_token.encode('utf-8'))
+    # Timestamp message (field 1 -> seconds) wrapped as field 4
+    ts = bytearray()
+    ts += _TAGS[1, 0]
+    _write_varint(ts, expiry)
+    _write_len_delim_field(ba, 4, ts)
 
 
 def read_varint(data: bytes, offset: int) -> tuple[int, int]:
@@ -31,49 +67,36 @@ def read_varint(data: bytes, offset: int) -> tuple[int, int]:
         shift += 7
     raise ValueError("Incomplete varint data")
 
-def create_string_field(field_num: int, value: str) -> bytes:
-    tag = (field_num << 3) | 2
-    tag_bytes = encode_varint(tag)
-    value_bytes = value.encode('utf-8')
-    len_bytes = encode_varint(len(value_bytes))
-    return tag_bytes + len_bytes + value_bytes
+def create_string_field(field_num: int, value: "str | bytes") -> bytes:
+    # bytes (e.g. base64 output) are written as-is; str is UTF-8 encoded
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    ba = bytearray()
+    _write_len_delim_field(ba, field_num, value)
+    return bytes(ba)
+
+# Fields with constant content, encoded once at import
+_BEARER_FIELD = create_string_field(2, "Bearer")
+_SENTINEL_FIELD = create_string_field(1, 'oauthTokenInfoSentinelKey')
 
 def create_timestamp_field(field_num: int, seconds: int) -> bytes:
     # Timestamp message: Field 1 (seconds) as varint. 
     # But usually Timestamp is int64, using varint here as per TS code logic.
-    inner_tag = (1 << 3) | 0
-    inner_tag_bytes = encode_varint(inner_tag)
-    seconds_bytes = encode_varint(seconds)
-    
-    inner_msg = inner_tag_bytes + seconds_bytes
+    inner_msg = bytearray()
+    inner_msg += _TAGS[1, 0]
+    _write_varint(inner_msg, seconds)
     
-    tag = (field_num << 3) | 2
-    tag_bytes = encode_varint(tag)
-    len_bytes = encode_varint(len(inner_msg))
-    
-    return tag_bytes + len_bytes + inner_msg
+    ba = bytearray()
+    _write_len_delim_field(ba, field_num, inner_msg)
+    return bytes(ba)
 
 def create_oauth_info(access_token: str, refresh_token: str, expiry: int) -> bytes:
-    # Field 1: Access Token (String)
-    field1 = create_string_field(1, access_token)
-    
-    # Field 2: Type ("Bearer")
-    field2 = create_string_field(2, "Bearer")
-    
-    # Field 3: Refresh Token (String)
-    field3 = create_string_field(3, refresh_token)
-    
-    # Field 4: Expiry (Timestamp wrapped in len delim)
-    # The TS code creates a Timestamp message (field 1 -> seconds) wrapped as field 4 (len delim).
-    field4 = create_timestamp_field(4, expiry)
-    
-    return field1 + field2 + field3 + field4
+    # Fields 1-3: access token, type ("Bearer"), refresh token; field 4: expiry timestamp
+    ba = bytearray()
+    _write_oauth_info(ba, access_token, refresh_token, expiry)
+    return bytes(ba)
 
 def create_unified_oauth_token(access_token: str, refresh_token: str, expiry: int) -> str:
-    oauth_info = create_oauth_info(access_token, refresh_token, expiry)
-    # Base64 encode the OAuth token info
-    oauth_info_b64 = base64.b64encode(oauth_info).decode('utf-8')
-    
     # Inner structure:
     # Field 1: string "oauthTokenInfoSentinelKey"
     # Field 2: string (base64 of oauth info) -> Wait, TS uses createStringField(1, oauthInfoB64) then createStringField(1, sentinel)??
@@ -104,23 +127,19 @@ def create_unified_oauth_token(access_token: str, refresh_token: str, expiry: in
     #      Field 1: { ...inner... }
     # 8. Return base64(outer).
     
-    # My implementation:
-    inner2_data = create_string_field(1, oauth_info_b64)
-    # Wrap inner2_data in Field 2
-    # encode_len_delim_field(2, inner2_data) logic:
-    tag2 = (2 << 3) | 2
-    tag2_bytes = encode_varint(tag2)
-    len2_bytes = encode_varint(len(inner2_data))
-    inner_field2 = tag2_bytes + len2_bytes + inner2_data
+    oauth_info = bytearray()
+    _write_oauth_info(oauth_info, access_token, refresh_token, expiry)
+    # Kept as bytes: it is ASCII and goes straight into the next field
+    oauth_info_b64 = base64.b64encode(oauth_info)
     
-    inner1 = create_string_field(1, 'oauthTokenInfoSentinelKey')
+    field2 = bytearray()
+    _write_len_delim_field(field2, 1, oauth_info_b64)
     
-    inner = inner1 + inner_field2
+    inner = bytearray()
+    inner += _SENTINEL_FIELD
+    _write_len_delim_field(inner, 2, field2)
     
-    # Wrap inner in Field 1
-    tag1 = (1 << 3) | 2
-    tag1_bytes = encode_varint(tag1)
-    len1_bytes = encode_varint(len(inner))
-    outer = tag1_bytes + len1_bytes + inner
+    outer = bytearray()
+    _write_len_delim_field(outer, 1, inner)
     
-    return base64.b64encode(outer).decode('utf-8')
+    return base64.b64encode(outer).decode('ascii')